@@ -8,6 +8,7 @@ class Config:
     def __init__(self):
         self.config_dir = Path.home() / ".config" / APP_NAME
         self.config_file = self.config_dir / "config.json"
+        self.link_index_file = self.config_dir / "links.json"
         self.data = {
             "source_dir": None,
             "dest_dir": None,
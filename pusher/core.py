@@ -1,40 +1,58 @@
 import subprocess
 import os
+import json
 
 def push_files(source_path, dest_path, files, dry_run=False):
     """
     Archives selected files/directories from source to destination using rsync.
-    files: list of paths relative to source_path
+    files: iterable of paths relative to source_path
     """
     if not files:
         return
 
     # We use --relative to preserve the directory structure
     # e.g. source/Shows/MyShow -> dest/Shows/MyShow
+    # Paths are streamed to rsync on stdin (--files-from implies --relative),
+    # so large selections never hit the argument length limit. They are
+    # NUL-terminated (--from0) so names may hold newlines, and prefixed with
+    # "./" so names starting with '#' or ';' are not read as comments.
+    # --files-from disables the recursion implied by -a, hence -r.
     cmd = [
         "rsync",
-        "-avP",
+        "-avrP",
         "--remove-source-files",
-        "--relative"
+        "--relative",
+        "--files-from=-",
+        "--from0"
     ]
     
     if dry_run:
         cmd.append("--dry-run")
-        
-    # Appending files to the command
-    cmd.extend(files)
     
     # Destination must be the directory ABOVE where we want to land if using --relative?
     # Actually, with --relative, if we are inside source_path, and we sync "A/B", 
     # and dest is dest_path, it will create dest_path/A/B.
     # So we should run the command from source_path and target dest_path.
     
+    cmd.append(".")
     cmd.append(dest_path)
     
     print(f"Executing: {' '.join(cmd)}")
     
     try:
-        subprocess.check_call(cmd, env=os.environ, cwd=source_path)
+        proc = subprocess.Popen(cmd, env=os.environ, cwd=source_path, stdin=subprocess.PIPE)
+        try:
+            for rel_path in files:
+                proc.stdin.write(b"./" + os.fsencode(rel_path) + b"\0")
+        except BrokenPipeError:
+            pass # rsync exited early; its exit status is reported below
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
         
         # Cleanup empty directories in source
         if not dry_run:
@@ -44,35 +62,258 @@ def push_files(source_path, dest_path, files, dry_run=False):
         print(f"Error during rsync: {e}")
         # In TUI we might want to catch this to show a popup
 
-def link_files(source_path, dest_path, files):
+def load_link_index(index_file):
+    """
+    Loads the link index, grouped by the directory holding each source:
+    {"dirs": {source_parent: {"mtime", "dev", "ino", "links": {link_path: {"target", "dev", "ino"}}}}}
+    Returns an empty index if the file is missing or unreadable.
+    """
+    index = {"dirs": {}}
+    if not index_file or not os.path.exists(index_file):
+        return index
+    try:
+        with open(index_file, "r") as f:
+            data = json.load(f)
+            if isinstance(data.get("dirs"), dict):
+                index = data
+    except (json.JSONDecodeError, OSError, AttributeError):
+        pass # Start with an empty index
+    return index
+
+def save_link_index(index_file, index):
+    parent = os.path.dirname(index_file)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    try:
+        with open(index_file, "w") as f:
+            json.dump(index, f, indent=4)
+    except OSError as e:
+        print(f"Error saving link index: {e}")
+
+def _index_entry(src):
+    # lstat: a dangling symlink is still a valid source to link to
+    st = os.lstat(src)
+    return {"target": src, "dev": st.st_dev, "ino": st.st_ino}
+
+def _index_group(parent):
+    st = os.stat(parent)
+    return {"mtime": st.st_mtime, "dev": st.st_dev, "ino": st.st_ino, "links": {}}
+
+def _record_link(index, dst, src):
+    parent = os.path.dirname(src)
+    group = index["dirs"].get(parent)
+    if group is None:
+        # A known group keeps its old mtime, so changes made since the
+        # last sync are still picked up by the next one.
+        group = _index_group(parent)
+        index["dirs"][parent] = group
+    group["links"][dst] = _index_entry(src)
+
+def _make_link(src, dst):
+    """Creates (or replaces) the symlink dst -> src. Returns True on success."""
+    parent = os.path.dirname(dst)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    if os.path.islink(dst):
+        os.unlink(dst)
+    elif os.path.exists(dst):
+        print(f"Warning: {dst} already exists and is not a symlink, skipping.")
+        return False
+
+    try:
+        os.symlink(src, dst)
+        print(f"Linked: {dst} -> {src}")
+        return True
+    except OSError as e:
+        print(f"Error creating symlink {dst}: {e}")
+        return False
+
+def _remove_link(dst, src):
+    # Only remove links that still point where we left them
+    if os.path.islink(dst) and os.readlink(dst) == src:
+        os.unlink(dst)
+        print(f"Removed: {dst}")
+        try:
+            os.rmdir(os.path.dirname(dst))
+        except OSError:
+            pass # Directory not empty
+
+def link_files(source_path, dest_path, files, index_file=None):
     """
     Creates symlinks in dest_path for selected files/directories from source_path.
-    files: list of paths relative to source_path
+    files: iterable of paths relative to source_path
+    index_file: optional path of the link index to record created links in
     """
     if not files:
         return
 
-    for rel_path in files:
-        src = os.path.join(source_path, rel_path)
-        dst = os.path.join(dest_path, rel_path)
+    index = load_link_index(index_file)
 
-        # Create parent directories if needed
-        parent = os.path.dirname(dst)
-        if parent:
-            os.makedirs(parent, exist_ok=True)
+    try:
+        for rel_path in files:
+            src = os.path.abspath(os.path.join(source_path, rel_path))
+            dst = os.path.abspath(os.path.join(dest_path, rel_path))
+
+            if _make_link(src, dst):
+                try:
+                    _record_link(index, dst, src)
+                except OSError as e:
+                    print(f"Warning: could not record {dst} in the link index: {e}")
+    finally:
+        # Links already created are recorded even if linking stops early
+        if index_file:
+            save_link_index(index_file, index)
+
+def _list_inodes(parent):
+    """Maps (device, inode) -> path for the entries of parent."""
+    inodes = {}
+    try:
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                inodes[(st.st_dev, st.st_ino)] = entry.path
+    except OSError:
+        pass
+    return inodes
 
-        if os.path.islink(dst):
-            os.unlink(dst)
-        elif os.path.exists(dst):
-            print(f"Warning: {dst} already exists and is not a symlink, skipping.")
+def _find_moved_parent(parent, group, listings):
+    """
+    Looks for a renamed source directory (by device/inode) next to where it was.
+    Returns its new path, None if it was deleted, or parent itself when it
+    cannot tell (the directory above is gone as well).
+    """
+    grandparent = os.path.dirname(parent)
+    if not os.path.isdir(grandparent):
+        return parent
+    if grandparent not in listings:
+        listings[grandparent] = _list_inodes(grandparent) # Once per directory
+    return listings[grandparent].get((group.get("dev"), group.get("ino")))
+
+def plan_link_sync(index, full=False):
+    """
+    Works out the links to add, update and remove without crawling the target.
+    Renaming or deleting a source changes the mtime of its parent directory,
+    so only the links under parents whose mtime changed are re-checked; the
+    cost is one stat per source directory plus the entries of changed ones.
+    A renamed source directory is followed when the directory above it still
+    exists. full re-checks every link, e.g. after links were removed from the
+    target by hand.
+    Returns (add, update, remove, checked): lists of (link_path, source_path)
+    and {source_parent: (new source_parent or None if it is gone, its mtime)}.
+    """
+    add, update, remove = [], [], []
+    checked = {}
+    listings = {}
+
+    for parent, group in index["dirs"].items():
+        new_parent = parent
+        try:
+            mtime = os.stat(parent).st_mtime
+        except OSError:
+            new_parent = _find_moved_parent(parent, group, listings)
+            if new_parent == parent:
+                print(f"Warning: {parent} is gone along with the directory above it, keeping its links.")
+                continue
+            mtime = os.stat(new_parent).st_mtime if new_parent else None
+        if new_parent == parent and mtime == group["mtime"] and not full:
             continue
 
+        links = group["links"]
+        if new_parent and new_parent != parent:
+            # Links mirror the source layout, so their directory was named after parent
+            if any(os.path.basename(os.path.dirname(dst)) != os.path.basename(parent) for dst in links):
+                print(f"Warning: cannot follow {parent} to {new_parent}, keeping its links.")
+                continue
+        checked[parent] = (new_parent, mtime)
+
+        inodes = None
+        claimed = set(links)
+        for dst, entry in links.items():
+            src = entry["target"]
+            if new_parent is None:
+                remove.append((dst, src))
+                continue
+
+            new_src = os.path.join(new_parent, os.path.basename(src))
+            new_dst = dst
+            if new_parent != parent:
+                new_dst = os.path.join(os.path.dirname(os.path.dirname(dst)), os.path.basename(new_parent), os.path.basename(dst))
+            if not os.path.lexists(new_src):
+                if inodes is None:
+                    inodes = _list_inodes(new_parent) # Once per directory
+                new_src = inodes.get((entry.get("dev"), entry.get("ino")))
+                if new_src is None:
+                    remove.append((dst, src))
+                    continue
+                new_dst = os.path.join(os.path.dirname(new_dst), os.path.basename(new_src))
+
+            if new_src != src:
+                remove.append((dst, src))
+                if new_dst not in claimed:
+                    claimed.add(new_dst)
+                    add.append((new_dst, new_src))
+            elif not (os.path.islink(dst) and os.readlink(dst) == src):
+                update.append((dst, src))
+
+    return add, update, remove, checked
+
+def sync_links(index_file, dry_run=False, full=False):
+    """
+    Reconciles the links recorded in index_file with their sources:
+    removes links to deleted sources, follows renamed sources and source
+    directories, and recreates links that went missing or point elsewhere.
+    """
+    index = load_link_index(index_file)
+    add, update, remove, checked = plan_link_sync(index, full=full)
+
+    print(f"Sync: {len(add)} to add, {len(update)} to update, {len(remove)} to remove.")
+    if dry_run:
+        for dst, src in add:
+            print(f"Would link: {dst} -> {src}")
+        for dst, src in update:
+            print(f"Would update: {dst} -> {src}")
+        for dst, src in remove:
+            print(f"Would remove: {dst}")
+        return
+
+    for dst, src in remove:
+        _remove_link(dst, src)
+        del index["dirs"][os.path.dirname(src)]["links"][dst]
+
+    # Re-key checked groups under their (possibly renamed) directory
+    for parent, (new_parent, mtime) in checked.items():
+        group = index["dirs"].pop(parent)
+        if new_parent is None:
+            continue
         try:
-            os.symlink(src, dst)
-            print(f"Linked: {dst} -> {src}")
-        except OSError as e:
-            print(f"Error creating symlink {dst}: {e}")
+            new_group = index["dirs"].get(new_parent) or _index_group(new_parent)
+        except OSError:
+            continue
+        new_group["links"].update(group["links"])
+        new_group["mtime"] = mtime
+        index["dirs"][new_parent] = new_group
+
+    for dst, src in add + update:
+        group = index["dirs"].get(os.path.dirname(src))
+        if group is None:
+            continue
+        links = group["links"]
+        links.pop(dst, None)
+        if _make_link(src, dst):
+            try:
+                links[dst] = _index_entry(src)
+            except OSError as e:
+                print(f"Warning: could not record {dst} in the link index: {e}")
+
+    for new_parent, _ in checked.values():
+        if new_parent in index["dirs"] and not index["dirs"][new_parent]["links"]:
+            del index["dirs"][new_parent]
 
+    save_link_index(index_file, index)
 
 def cleanup_empty_dirs(path):
     """Recursively delete empty directories."""
@@ -3,7 +3,8 @@ import sys
 import curses
 import os
 from pusher.tui import FileBrowser, setup_colors
-from pusher.core import push_files, link_files
+from pusher.selection import Selection
+from pusher.core import push_files, link_files, sync_links
 from pusher.config import Config
 
 def pick_directory(stdscr, start_path, title):
@@ -61,7 +62,7 @@ def run_setup(stdscr, config):
     # Pre-select current directory (rel_cwd)
     # Using "." here only works if browser root is cwd. Since root is /, we need path relative to /.
     # If we are at root, rel_cwd is empty, so use "."
-    browser.selected = {rel_cwd} if rel_cwd else {"."}
+    browser.picked = rel_cwd if rel_cwd else "."
     
     msg_lines = [
         "First time running the app? Let's get you setup!",
@@ -149,9 +150,22 @@ def main():
     parser = argparse.ArgumentParser(description="Archive managed media files.")
     parser.add_argument("--dry-run", action="store_true", help="Perform a dry run of rsync")
     parser.add_argument("--config", action="store_true", help="Open configuration menu")
+    subparsers = parser.add_subparsers(dest="command")
+    link_parser = subparsers.add_parser("link", help="Manage links created in link mode")
+    link_parser.add_argument("--sync", action="store_true", help="Add, update and remove links to match their sources")
+    link_parser.add_argument("--full", action="store_true", help="Re-check every link, not just those in changed source directories")
+    link_parser.add_argument("--dry-run", action="store_true", default=argparse.SUPPRESS, help="Show the changes without applying them")
     args = parser.parse_args()
 
     config = Config()
+
+    if args.command == "link":
+        if not args.sync:
+            link_parser.print_help()
+            return
+        sync_links(str(config.link_index_file), dry_run=args.dry_run, full=args.full)
+        print("Done.")
+        return
     
     def tui_entry(stdscr):
         # Check config
@@ -181,7 +195,7 @@ def main():
             f"Target: {dest}",
             "",
             "Select the files or folders you want to push.",
-            f"Press [Space] to toggle selection, {action_key}."
+            f"[Space] toggles, [v] selects a range, [a] all, [/] by pattern, [x] clears. {action_key}."
         ]
         
         while True:
@@ -216,11 +230,11 @@ def main():
                         f"Target: {dest}",
                         "",
                         "Select the files or folders you want to push.",
-                        f"Press [Space] to toggle selection, {action_key}."
+                        f"[Space] toggles, [v] selects a range, [a] all, [/] by pattern, [x] clears. {action_key}."
                     ]
                 continue
                 
-            if isinstance(result, list):
+            if isinstance(result, Selection):
                 return result
 
     try:
@@ -233,7 +247,7 @@ def main():
 
             if link_mode:
                 print(f"Linking {len(selected_files)} items from {source_dir} to {dest_dir}...")
-                link_files(source_dir, dest_dir, selected_files)
+                link_files(source_dir, dest_dir, selected_files, index_file=str(config.link_index_file))
             else:
                 print(f"Pushing {len(selected_files)} items from {source_dir} to {dest_dir}...")
                 push_files(source_dir, dest_dir, selected_files, dry_run=args.dry_run)
@@ -0,0 +1,170 @@
+import fnmatch
+import os
+import re
+
+
+class _Node:
+    __slots__ = ("children", "selected")
+
+    def __init__(self):
+        self.children = {}
+        self.selected = False
+
+
+class Selection:
+    """
+    Set of paths relative to root_path, stored as a prefix tree of path
+    components. Selecting a directory covers everything below it, so nested
+    selections collapse to their selected ancestor and membership is a walk
+    of at most one node per path component.
+    """
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self._root = _Node()
+        self._count = 0
+
+    @staticmethod
+    def _parts(rel_path):
+        rel_path = os.path.normpath(rel_path)
+        if rel_path == ".":
+            return []
+        return rel_path.split(os.sep)
+
+    @staticmethod
+    def _count_selected(node):
+        count = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.selected:
+                count += 1
+            stack.extend(current.children.values())
+        return count
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __contains__(self, rel_path):
+        node = self._root
+        if node.selected:
+            return True
+        for part in self._parts(rel_path):
+            node = node.children.get(part)
+            if node is None:
+                return False
+            if node.selected:
+                return True
+        return False
+
+    def __iter__(self):
+        """Yields the selected paths (collapsed to their ancestors) in sorted order."""
+        stack = [(self._root, [])]
+        while stack:
+            node, parts = stack.pop()
+            if node.selected:
+                yield os.path.join(*parts) if parts else "."
+                continue
+            for name in sorted(node.children, reverse=True):
+                stack.append((node.children[name], parts + [name]))
+
+    def add(self, rel_path):
+        node = self._root
+        for part in self._parts(rel_path):
+            if node.selected:
+                return # Already covered by an ancestor
+            node = node.children.setdefault(part, _Node())
+        if node.selected:
+            return
+
+        # Descendants are covered by this node now
+        self._count -= self._count_selected(node)
+        node.children = {}
+        node.selected = True
+        self._count += 1
+
+    def remove(self, rel_path):
+        parts = self._parts(rel_path)
+        path = [self._root]
+        for part in parts:
+            node = path[-1]
+            if node.selected:
+                break
+            child = node.children.get(part)
+            if child is None:
+                return # Not selected
+            path.append(child)
+
+        node = path[-1]
+        if not node.selected:
+            return
+        node.selected = False
+        self._count -= 1
+
+        # The path was covered by a selected ancestor: select the siblings
+        # along the way down instead, so only rel_path drops out.
+        depth = len(path) - 1
+        for i in range(depth, len(parts)):
+            dir_rel = os.path.join(*parts[:i]) if i else "."
+            try:
+                names = os.listdir(os.path.join(self.root_path, dir_rel))
+            except OSError:
+                names = []
+            for name in names:
+                if name != parts[i]:
+                    sibling = node.children.setdefault(name, _Node())
+                    sibling.selected = True
+                    self._count += 1
+            node = node.children.setdefault(parts[i], _Node())
+
+        self._prune(parts)
+
+    def _prune(self, parts):
+        """Drops empty, unselected nodes left along parts."""
+        path = [self._root]
+        for part in parts:
+            child = path[-1].children.get(part)
+            if child is None:
+                break
+            path.append(child)
+        for i in range(len(path) - 1, 0, -1):
+            node = path[i]
+            if node.selected or node.children:
+                break
+            del path[i - 1].children[parts[i - 1]]
+
+    def toggle(self, rel_path):
+        if rel_path in self:
+            self.remove(rel_path)
+        else:
+            self.add(rel_path)
+
+    def clear(self):
+        self._root = _Node()
+        self._count = 0
+
+    def select_pattern(self, dir_rel_path, pattern):
+        """
+        Selects entries of dir_rel_path whose name matches pattern.
+        Patterns are globs, or regular expressions when prefixed with 're:'.
+        Returns the number of matching entries.
+        """
+        if pattern.startswith("re:"):
+            match = re.compile(pattern[3:]).search
+        else:
+            match = re.compile(fnmatch.translate(pattern)).match
+
+        try:
+            names = os.listdir(os.path.join(self.root_path, dir_rel_path))
+        except OSError:
+            return 0
+
+        matched = 0
+        for name in names:
+            if match(name):
+                self.add(os.path.join(dir_rel_path, name))
+                matched += 1
+        return matched
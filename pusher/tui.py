@@ -1,7 +1,9 @@
 import curses
 import os
+import re
 import sys
 from pusher.core import push_files
+from pusher.selection import Selection
 
 # Colors
 def setup_colors():
@@ -29,7 +31,9 @@ class FileBrowser:
         self.width = max_w
         
         self.files = []
-        self.selected = set() # Set of paths relative to root_path (only for file_selection)
+        self.selected = Selection(self.root_path) # Paths relative to root_path (only for file_selection)
+        self.picked = None # Path relative to root_path (only for dir_picker)
+        self.anchor_idx = None # Start of range selection
         self.cursor_idx = 0
         self.offset = 0
         
@@ -119,10 +123,11 @@ class FileBrowser:
             full_path_item = os.path.join(self.root_path, rel_path)
             
             is_cursor = (idx == self.cursor_idx)
-            is_selected = False
             # Check selection based on RELATIVE path
-            if rel_path in self.selected:
-                is_selected = True
+            if self.mode == 'dir_picker':
+                is_selected = (rel_path == self.picked)
+            else:
+                is_selected = (rel_path in self.selected)
             
             style = curses.color_pair(1)
             # Highlight cursor row background
@@ -162,7 +167,7 @@ class FileBrowser:
 
         # Footer
         if self.mode == 'file_selection':
-            footer = " [↑/↓] Navigate  [←/→] In/Out  [Space] Select  [Enter] Confirm  [s] Settings  [q] Quit "
+            footer = " [↑/↓] Navigate  [←/→] In/Out  [Space] Select  [v] Range  [a] All  [/] Pattern  [x] Clear  [Enter] Confirm  [s] Settings  [q] Quit "
         else:
             footer = " [↑/↓] Navigate  [←/→] In/Out  [Space] Select  [Enter] Confirm  [q] Quit "
         
@@ -173,7 +178,7 @@ class FileBrowser:
         # Let's simple format the keys nicely.
         
         # Pad footer
-        footer = footer.ljust(self.width - 1) # -1 to avoid bottom-right corner error
+        footer = footer[:self.width - 1].ljust(self.width - 1) # -1 to avoid bottom-right corner error
         
         try:
              # Draw footer at bottom
@@ -210,14 +215,43 @@ class FileBrowser:
             rel_path = self.get_full_rel_path(item)
             
             if self.mode == 'file_selection':
-                if rel_path in self.selected:
-                    self.selected.remove(rel_path)
-                else:
-                    self.selected.add(rel_path)
+                self.selected.toggle(rel_path)
+                # A deselected item must not start a range that reselects it
+                self.anchor_idx = self.cursor_idx if rel_path in self.selected else None
             elif self.mode == 'dir_picker':
                 full_path_item = os.path.join(self.root_path, rel_path)
                 if os.path.isdir(full_path_item):
-                    self.selected = {rel_path}
+                    self.picked = rel_path
+
+        elif key == ord('v') and self.mode == 'file_selection': # Range from last Space/v to cursor
+            if self.anchor_idx is None:
+                # No anchor yet: mark the start of the range
+                self.anchor_idx = self.cursor_idx
+                return None
+            start = min(self.anchor_idx, self.cursor_idx)
+            end = max(self.anchor_idx, self.cursor_idx)
+            for item in self.files[start:end + 1]:
+                if item not in (".", ".."):
+                    self.selected.add(self.get_full_rel_path(item))
+            self.anchor_idx = self.cursor_idx
+
+        elif key == ord('a') and self.mode == 'file_selection': # All in current directory
+            for item in self.files:
+                if item not in (".", ".."):
+                    self.selected.add(self.get_full_rel_path(item))
+
+        elif key == ord('x') and self.mode == 'file_selection': # Clear selection
+            self.selected.clear()
+            self.anchor_idx = None
+
+        elif key == ord('/') and self.mode == 'file_selection': # Glob, or regex with "re:"
+            pattern = self.prompt(" Select matching (glob, or re:regex): ")
+            if pattern:
+                try:
+                    matched = self.selected.select_pattern(self.current_rel_path, pattern)
+                    self.message(f" Selected {matched} matching item(s). Press any key. ")
+                except re.error as e:
+                    self.message(f" Invalid pattern: {e}. Press any key. ")
 
         elif key == ord('l') or key == curses.KEY_RIGHT: # Right or l (Enter Directory)
             item = self.files[self.cursor_idx]
@@ -234,6 +268,7 @@ class FileBrowser:
                 self.current_rel_path = rel_path
                 self.cursor_idx = 0
                 self.offset = 0
+                self.anchor_idx = None
                 self.refresh_file_list()
         
         elif key in [ord('h'), curses.KEY_BACKSPACE, 127, 8, curses.KEY_LEFT]: # Back
@@ -243,16 +278,17 @@ class FileBrowser:
                         self.current_rel_path = "."
                     self.cursor_idx = 0
                     self.offset = 0
+                    self.anchor_idx = None
                     self.refresh_file_list()
         
         elif key == 10: # Enter (Confirm/Push)
             # DIR PICKER: Confirm directory
             if self.mode == 'dir_picker':
                  # Explicit selection required.
-                 if not self.selected:
+                 if self.picked is None:
                      return None
                      
-                 rel = list(self.selected)[0]
+                 rel = self.picked
                  return os.path.abspath(os.path.join(self.root_path, rel))
             
             # FILE SELECTION: Push
@@ -266,7 +302,7 @@ class FileBrowser:
                     self.stdscr.addstr(confirm_y, 0, f" {self.operation} selection? (y/N) ".ljust(self.width), curses.color_pair(2))
                     confirm = self.stdscr.getch()
                     if confirm == ord('y'):
-                        return list(self.selected)
+                        return self.selected
                 except curses.error:
                     pass
                 
@@ -275,6 +311,34 @@ class FileBrowser:
 
         return None
 
+    def prompt(self, text):
+        """Reads a line of input on the confirmation row."""
+        prompt_y = self.y_offset + self.height - 2
+        try:
+            self.stdscr.addstr(prompt_y, 0, text.ljust(self.width - 1), curses.color_pair(2))
+            self.stdscr.move(prompt_y, len(text))
+            curses.echo()
+            curses.curs_set(1)
+            value = self.stdscr.getstr(prompt_y, len(text)).decode("utf-8", "replace")
+        except curses.error:
+            return None
+        finally:
+            curses.noecho()
+            try:
+                curses.curs_set(0)
+            except curses.error:
+                pass
+        return value.strip()
+
+    def message(self, text):
+        """Shows text on the confirmation row until a key is pressed."""
+        message_y = self.y_offset + self.height - 2
+        try:
+            self.stdscr.addstr(message_y, 0, text[:self.width - 1].ljust(self.width - 1), curses.color_pair(2))
+            self.stdscr.getch()
+        except curses.error:
+            pass
+
     def run(self):
         self.refresh_file_list()
         while True:
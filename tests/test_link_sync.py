@@ -0,0 +1,79 @@
+import os
+
+from pusher.core import link_files, load_link_index, sync_links
+
+
+def make_tree(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    (src / "Show").mkdir(parents=True)
+    (src / "Other").mkdir()
+    dst.mkdir()
+    for name in ["Show/e1.mkv", "Show/e2.mkv", "Other/x.mkv", "m1.mkv"]:
+        (src / name).touch()
+    index_file = str(tmp_path / "links.json")
+    link_files(str(src), str(dst), ["Show/e1.mkv", "Show/e2.mkv", "Other/x.mkv", "m1.mkv"], index_file=index_file)
+    return src, dst, index_file
+
+
+def links_in(dst):
+    found = {}
+    for root, dirs, files in os.walk(dst):
+        for name in files + dirs:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                found[os.path.relpath(path, dst)] = os.readlink(path)
+    return found
+
+
+def test_sync_follows_renames_and_removes_deleted(tmp_path):
+    src, dst, index_file = make_tree(tmp_path)
+    (src / "m1.mkv").rename(src / "m2.mkv")
+    (src / "Show").rename(src / "Series")
+    (src / "Series" / "e2.mkv").rename(src / "Series" / "E02.mkv")
+    (src / "Other" / "x.mkv").unlink()
+
+    sync_links(index_file)
+
+    assert links_in(dst) == {
+        "m2.mkv": str(src / "m2.mkv"),
+        os.path.join("Series", "e1.mkv"): str(src / "Series" / "e1.mkv"),
+        os.path.join("Series", "E02.mkv"): str(src / "Series" / "E02.mkv"),
+    }
+    assert not (dst / "Show").exists()
+    assert set(load_link_index(index_file)["dirs"]) == {str(src), str(src / "Series")}
+
+
+def test_sync_dry_run_changes_nothing(tmp_path):
+    src, dst, index_file = make_tree(tmp_path)
+    (src / "m1.mkv").unlink()
+
+    sync_links(index_file, dry_run=True)
+
+    assert "m1.mkv" in links_in(dst)
+
+
+def test_sync_full_restores_links_removed_by_hand(tmp_path):
+    src, dst, index_file = make_tree(tmp_path)
+    (dst / "Show" / "e1.mkv").unlink()
+
+    # The source directory did not change, so a regular sync skips it
+    sync_links(index_file)
+    assert os.path.join("Show", "e1.mkv") not in links_in(dst)
+
+    sync_links(index_file, full=True)
+    assert links_in(dst)[os.path.join("Show", "e1.mkv")] == str(src / "Show" / "e1.mkv")
+
+
+def test_link_files_records_dangling_symlink(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    src.mkdir()
+    (src / "a.mkv").touch()
+    os.symlink(str(tmp_path / "nowhere"), str(src / "broken"))
+    index_file = str(tmp_path / "links.json")
+
+    link_files(str(src), str(dst), ["a.mkv", "broken"], index_file=index_file)
+
+    assert set(links_in(dst)) == {"a.mkv", "broken"}
+    assert set(load_link_index(index_file)["dirs"][str(src)]["links"]) == {str(dst / "a.mkv"), str(dst / "broken")}
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from pusher.selection import Selection
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ["Show/S01/e1.mkv", "Show/S01/e2.mkv", "Show/S02/e1.mkv", "notes.txt"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    return tmp_path
+
+
+def test_add_collapses_into_ancestor(tree):
+    selection = Selection(str(tree))
+    selection.add("Show/S01/e1.mkv")
+    selection.add("Show/S02")
+    selection.add("Show")
+
+    assert list(selection) == ["Show"]
+    assert len(selection) == 1
+    assert "Show/S01/e2.mkv" in selection
+    assert "notes.txt" not in selection
+
+
+def test_remove_nested_path_selects_siblings(tree):
+    selection = Selection(str(tree))
+    selection.add("Show")
+    selection.remove("Show/S01/e1.mkv")
+
+    assert list(selection) == [os.path.join("Show", "S01", "e2.mkv"), os.path.join("Show", "S02")]
+    assert len(selection) == 2
+    assert "Show/S01/e1.mkv" not in selection
+    assert "Show/S01" not in selection
+
+    selection.remove("Show/S01/e2.mkv")
+    assert list(selection) == [os.path.join("Show", "S02")]
+    assert len(selection) == 1
+
+
+def test_toggle_root(tree):
+    selection = Selection(str(tree))
+    selection.toggle(".")
+
+    assert list(selection) == ["."]
+    assert "Show/S02/e1.mkv" in selection
+
+    selection.toggle(".")
+    assert list(selection) == []
+    assert not selection
+
+
+def test_select_pattern(tree):
+    selection = Selection(str(tree))
+
+    assert selection.select_pattern("Show/S01", "*1.mkv") == 1
+    assert list(selection) == [os.path.join("Show", "S01", "e1.mkv")]
+
+    assert selection.select_pattern("Show/S01", "re:^e\\d") == 2
+    assert list(selection) == [os.path.join("Show", "S01", "e1.mkv"), os.path.join("Show", "S01", "e2.mkv")]
+    assert len(selection) == 2
+
+    assert selection.select_pattern(".", "*.txt") == 1
+    assert "notes.txt" in selection